@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import Site, Translation
+
+LANGUAGES = [code for code, _ in Translation.LANGUAGE_CHOICES]
+
+SUMMARY_CACHE_KEY = 'app_lms:coverage_summary'
+
+
+def coverage_summary(use_cache=True):
+    """
+    Per-site key counts and completion percentage for every language.
+
+    Computed with a single grouped query over all sites; the result is
+    cached for TRANSLATION_COVERAGE_CACHE_TIMEOUT seconds.
+    """
+    if use_cache:
+        summary = cache.get(SUMMARY_CACHE_KEY)
+        if summary is not None:
+            return summary
+
+    aggregates = {'total_keys': Count('translations__key', distinct=True)}
+    for lang in LANGUAGES:
+        aggregates[lang] = Count('translations', filter=Q(translations__language=lang))
+
+    summary = []
+    for row in Site.objects.values('name').annotate(**aggregates).order_by('name'):
+        total = row['total_keys']
+        languages = {}
+        for lang in LANGUAGES:
+            present = row[lang]
+            languages[lang] = {
+                'keys': present,
+                'missing': total - present,
+                'completion': round(100.0 * present / total, 2) if total else 100.0,
+            }
+        summary.append({'site': row['name'], 'total_keys': total, 'languages': languages})
+
+    if use_cache:
+        timeout = getattr(settings, 'TRANSLATION_COVERAGE_CACHE_TIMEOUT', 60)
+        cache.set(SUMMARY_CACHE_KEY, summary, timeout)
+    return summary
+
+
+def missing_keys(source, target, site_names=None):
+    """
+    Yield (site_name, key) for keys present in `source` but not in `target`.
+
+    The anti-join runs as one NOT EXISTS query across all sites and rows are
+    streamed from a server-side iterator.
+    """
+    in_target = Translation.objects.filter(
+        site=OuterRef('site'),
+        key=OuterRef('key'),
+        language=target,
+    )
+    translations = Translation.objects.filter(language=source).filter(~Exists(in_target))
+    if site_names:
+        translations = translations.filter(site__name__in=site_names)
+    return (
+        translations
+        .order_by('site__name', 'key')
+        .values_list('site__name', 'key')
+        .iterator(chunk_size=2000)
+    )
+
+
+def language_pairs(source=None, target=None):
+    """All (source, target) pairs to compare, optionally narrowed down."""
+    return [
+        (src, dst)
+        for src in LANGUAGES
+        for dst in LANGUAGES
+        if src != dst and source in (None, src) and target in (None, dst)
+    ]
@@ -0,0 +1,53 @@
+import json
+import zlib
+from itertools import groupby
+
+from .models import Translation
+
+STREAM_FORMATS = ('ndjson', 'json')
+
+
+def translation_rows(site_names):
+    """
+    Yield (site, language, key_type, key, value) ordered by site, language
+    and key, straight from a server-side DB iterator.
+    """
+    return (
+        Translation.objects
+        .filter(site__name__in=site_names)
+        .with_resolved_value()
+        .order_by('site__name', 'language', 'key')
+        .values_list('site__name', 'language', 'key_type', 'key', 'resolved_value')
+        .iterator(chunk_size=2000)
+    )
+
+
+def ndjson_rows(rows):
+    """One JSON line per translation."""
+    for site, language, key_type, key, value in rows:
+        yield json.dumps({
+            "site": site,
+            "language": language,
+            "key_type": key_type,
+            "key": key,
+            "value": value
+        }) + "\n"
+
+
+def json_objects(rows):
+    """One JSON line per site and language, keys grouped by key_type like the ZIP files."""
+    for (site, language), group in groupby(rows, key=lambda row: (row[0], row[1])):
+        translations = {'TPL': {}, 'INI': {}}
+        for _, _, key_type, key, value in group:
+            # Like the ZIP export, anything that is not TPL goes with INI
+            translations['TPL' if key_type == 'TPL' else 'INI'][key] = value
+        yield json.dumps({"site": site, "language": language, "translations": translations}) + "\n"
+
+
+def gzip_stream(chunks, level=6):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
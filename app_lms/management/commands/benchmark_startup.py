@@ -0,0 +1,84 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter per sample so nothing is imported yet
+CHILD = """
+import json, sys, time
+from wsgiref.util import setup_testing_defaults
+
+start = time.perf_counter()
+from django.conf import settings
+# Same DEBUG for every profile, so only the stack itself is compared
+settings.DEBUG = sys.argv[2] == 'on'
+settings.ALLOWED_HOSTS = ['localhost']
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+setup = time.perf_counter()
+
+def request():
+    environ = {'PATH_INFO': sys.argv[1], 'HTTP_HOST': 'localhost'}
+    setup_testing_defaults(environ)
+    began = time.perf_counter()
+    status = []
+    response = application(environ, lambda s, h, exc_info=None: status.append(s))
+    b''.join(response)
+    getattr(response, 'close', lambda: None)()
+    return time.perf_counter() - began, status[0]
+
+first, status = request()
+second, _ = request()
+print(json.dumps({
+    'setup': setup - start,
+    'first': first,
+    'second': second,
+    'status': status,
+    'modules': len(sys.modules),
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare cold start and first request latency of settings profiles (run migrate first)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=['lms_demo.settings', 'lms_demo.settings_api'],
+            help="Settings modules to compare"
+        )
+        parser.add_argument('--runs', type=int, default=5, help="Fresh processes per profile")
+        parser.add_argument('--path', default='/api/sites/', help="Path requested after start-up")
+        parser.add_argument(
+            '--debug', choices=['on', 'off'], default='off',
+            help="DEBUG value forced on every profile"
+        )
+
+    def handle(self, *args, **options):
+        for profile in options['profiles']:
+            env = dict(os.environ, DJANGO_SETTINGS_MODULE=profile)
+            samples = []
+            for _ in range(options['runs']):
+                began = time.perf_counter()
+                output = subprocess.run(
+                    [sys.executable, '-c', CHILD, options['path'], options['debug']],
+                    env=env, capture_output=True, text=True, check=True
+                ).stdout
+                sample = json.loads(output.strip().splitlines()[-1])
+                sample['process'] = time.perf_counter() - began
+                samples.append(sample)
+
+            def median_ms(name):
+                return statistics.median(s[name] for s in samples) * 1000
+
+            self.stdout.write(
+                f"{profile}: process {median_ms('process'):.1f}ms, "
+                f"import+setup {median_ms('setup'):.1f}ms, "
+                f"first request {median_ms('first'):.1f}ms, "
+                f"warm request {median_ms('second'):.2f}ms, "
+                f"{samples[-1]['modules']} modules, status {samples[-1]['status']}"
+            )
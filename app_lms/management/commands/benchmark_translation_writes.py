@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app_lms.models import Site
+from app_lms.serializers import TranslationSerializer
+from app_lms.write_behind import WriteBehindQueue
+
+
+class Command(BaseCommand):
+    help = "Measure sustained single-translation writes per second, direct vs write-behind"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=2000, help="Translations written per mode")
+        parser.add_argument('--mode', choices=['direct', 'write-behind', 'both'], default='both')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        modes = ['direct', 'write-behind'] if options['mode'] == 'both' else [options['mode']]
+
+        for mode in modes:
+            site = Site.objects.create(name=f"benchmark-{mode}-{time.time_ns()}")
+            payloads = [
+                {"site": site.name, "key": f"__bench.key{i}", "value": f"value {i}", "language": "EN"}
+                for i in range(count)
+            ]
+            try:
+                elapsed = self.run_direct(payloads) if mode == 'direct' else self.run_write_behind(payloads)
+                written = site.translations.count()
+            finally:
+                site.delete()
+
+            self.stdout.write(
+                f"{mode:>12}: {written} rows in {elapsed:.3f}s ({written / elapsed:,.0f} writes/s)"
+            )
+
+    def run_direct(self, payloads):
+        start = time.perf_counter()
+        for data in payloads:
+            serializer = TranslationSerializer(data=data)
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        return time.perf_counter() - start
+
+    def run_write_behind(self, payloads):
+        write_queue = WriteBehindQueue(
+            interval_ms=getattr(settings, 'TRANSLATION_WRITE_BEHIND_INTERVAL_MS', 50),
+            batch_size=getattr(settings, 'TRANSLATION_WRITE_BEHIND_BATCH_SIZE', 500),
+        )
+        start = time.perf_counter()
+        write_queue.start()
+        for data in payloads:
+            serializer = TranslationSerializer(data=data)
+            serializer.is_valid(raise_exception=True)
+            write_queue.put(serializer.validated_data)
+        # Elapsed time includes draining the queue, i.e. until every row is committed
+        write_queue.stop()
+        return time.perf_counter() - start
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Length
+
+from app_lms.models import Translation, TranslationValue
+
+
+class Command(BaseCommand):
+    help = "Move translation values into the deduplicated value table, or back with --inflate"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--inflate', action='store_true', help="Copy values back into Translation rows")
+
+    def handle(self, *args, **options):
+        self.report("Before")
+        if options['inflate']:
+            self.inflate()
+        else:
+            self.dedupe(options['batch_size'])
+        # Values no longer referenced by any translation
+        TranslationValue.objects.filter(translations__isnull=True).delete()
+        self.report("After")
+
+    def dedupe(self, batch_size):
+        pending = (
+            Translation.objects
+            .filter(value_ref__isnull=True)
+            .exclude(value='')
+            .select_related(None)
+            .order_by('pk')
+            .only('pk', 'value', 'value_ref')
+        )
+        last_pk = 0
+        while True:
+            batch = list(pending.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return
+            last_pk = batch[-1].pk
+            with transaction.atomic():
+                stored = TranslationValue.intern_many(t.value for t in batch)
+                for translation in batch:
+                    translation.value_ref = stored[translation.value]
+                Translation.objects.bulk_update(batch, ['value_ref'])
+                Translation.objects.filter(pk__in=[t.pk for t in batch]).update(value='')
+
+    def inflate(self):
+        shared_value = TranslationValue.objects.filter(pk=OuterRef('value_ref')).values('value')[:1]
+        with transaction.atomic():
+            Translation.objects.filter(value_ref__isnull=False).update(
+                value=Subquery(shared_value),
+                value_ref=None
+            )
+
+    def report(self, label):
+        inline = Translation.objects.aggregate(size=Sum(Length('value')))['size'] or 0
+        shared = TranslationValue.objects.aggregate(size=Sum(Length('value')))['size'] or 0
+        self.stdout.write(
+            f"{label}: {Translation.objects.count()} translations, "
+            f"{inline} chars inline, "
+            f"{TranslationValue.objects.count()} shared values ({shared} chars)"
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from app_lms.models import Site
+from app_lms.stats import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recompute TranslationStats counters from the Translation table"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--site', default='', help="Comma separated site names (default: all sites)")
+
+    def handle(self, *args, **options):
+        site_names = [name.strip() for name in options['site'].split(',') if name.strip()]
+        site_ids = None
+        if site_names:
+            site_ids = list(Site.objects.filter(name__in=site_names).values_list('id', flat=True))
+        reconcile(site_ids)
+        self.stdout.write(self.style.SUCCESS("Translation stats reconciled"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app_lms.coverage import LANGUAGES, coverage_summary, language_pairs, missing_keys
+
+
+class Command(BaseCommand):
+    help = "Report per-site translation coverage and keys missing from a language"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--missing', action='store_true', help="List missing keys instead of the summary")
+        parser.add_argument('--source', choices=LANGUAGES, help="Language the keys must exist in")
+        parser.add_argument('--target', choices=LANGUAGES, help="Language the keys are missing from")
+        parser.add_argument('--site', default='', help="Comma separated site names (default: all sites)")
+
+    def handle(self, *args, **options):
+        site_names = [name.strip() for name in options['site'].split(',') if name.strip()]
+
+        if options['missing']:
+            pairs = language_pairs(options['source'], options['target'])
+            if not pairs:
+                raise CommandError("Source and target languages must differ")
+            for src, dst in pairs:
+                for site_name, key in missing_keys(src, dst, site_names):
+                    self.stdout.write(f"{site_name}\t{key}\t{src}->{dst}")
+            return
+
+        for row in coverage_summary(use_cache=False):
+            if site_names and row['site'] not in site_names:
+                continue
+            languages = "  ".join(
+                f"{lang}: {info['completion']:.2f}% ({info['missing']} missing)"
+                for lang, info in row['languages'].items()
+            )
+            self.stdout.write(f"{row['site']}  keys={row['total_keys']}  {languages}")
@@ -0,0 +1,267 @@
+import cProfile
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import JsonResponse
+
+DEFAULT_ADMISSION_POOLS = {
+    'heavy': {'LIMIT': 2, 'QUEUE': 4, 'TIMEOUT': 10, 'RETRY_AFTER': 5},
+    'light': {'LIMIT': 64, 'QUEUE': 128, 'TIMEOUT': 2, 'RETRY_AFTER': 1},
+}
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status, retry_after):
+        super().__init__(status)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class AdmissionPool:
+    """
+    At most `limit` requests run at once; up to `queue` more wait for a slot
+    for at most `timeout` seconds. Anything beyond that is rejected with 429,
+    a request that waited and timed out gets 503.
+    """
+
+    def __init__(self, name, limit, queue, timeout, retry_after):
+        self.name = name
+        self.queue = queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.Semaphore(limit)
+        self._lock = threading.Lock()
+        self._waiting = 0
+
+    def acquire(self):
+        if self._slots.acquire(blocking=False):
+            return
+        with self._lock:
+            if self._waiting >= self.queue:
+                raise AdmissionRejected(429, self.retry_after)
+            self._waiting += 1
+        try:
+            admitted = self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not admitted:
+            raise AdmissionRejected(503, self.retry_after)
+
+    def release(self):
+        self._slots.release()
+
+
+class AdmissionControlMiddleware:
+    """
+    Limits concurrency per pool of API views. A view picks its pool per
+    HTTP method with an `admission_pools` attribute, e.g.
+    ``admission_pools = {'get': 'heavy'}``; everything else runs in the
+    'light' pool so cheap requests are not starved by heavy ones.
+    Pools are configured with the ADMISSION_CONTROL setting.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = getattr(settings, 'ADMISSION_CONTROL', DEFAULT_ADMISSION_POOLS)
+        self.pools = {
+            name: AdmissionPool(
+                name,
+                limit=options['LIMIT'],
+                queue=options['QUEUE'],
+                timeout=options['TIMEOUT'],
+                retry_after=options['RETRY_AFTER'],
+            )
+            for name, options in config.items()
+        }
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        pool = getattr(request, '_admission_pool', None)
+        if pool is None:
+            return response
+        if response.streaming:
+            # Hold the slot until the body has been sent
+            response.streaming_content = self._release_after(response.streaming_content, pool)
+        else:
+            pool.release()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if view_class is None:
+            return None
+        pool_name = getattr(view_class, 'admission_pools', {}).get(request.method.lower(), 'light')
+        pool = self.pools.get(pool_name)
+        if pool is None:
+            return None
+
+        try:
+            pool.acquire()
+        except AdmissionRejected as e:
+            response = JsonResponse(
+                {"error": f"Too many concurrent {pool_name} requests, retry later"},
+                status=e.status
+            )
+            response['Retry-After'] = str(e.retry_after)
+            return response
+        request._admission_pool = pool
+        return None
+
+    @staticmethod
+    def _release_after(content, pool):
+        try:
+            yield from content
+        finally:
+            pool.release()
+
+# Held while a cProfile profiler is enabled, see ProfilingMiddleware
+_cprofile_lock = threading.Lock()
+
+
+class WallClockSampler:
+    """
+    Samples the stack of one thread every `interval` seconds, including time
+    spent blocked on I/O, and writes it in the collapsed format read by
+    flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.items():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when its HEADER carries the configured SECRET or it is
+    picked by the sampling rate, and writes the result to OUTPUT_DIR as
+    ``<view>.<queries>q.<duration>ms.<timestamp>.prof`` (cProfile) or
+    ``.folded`` (wall-clock sampler). Nothing is profiled once OUTPUT_DIR
+    holds MAX_DUMPS files. Configured with REQUEST_PROFILING; when disabled
+    the middleware is dropped from the stack entirely.
+    """
+
+    def __init__(self, get_response):
+        config = getattr(settings, 'REQUEST_PROFILING', {})
+        if not config.get('ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.header = config.get('HEADER', 'X-Profile')
+        # Without a secret the header is ignored and only sampling applies
+        self.secret = config.get('SECRET', '')
+        self.max_dumps = config.get('MAX_DUMPS', 100)
+        self.sample_rate = config.get('SAMPLE_RATE', 0.0)
+        self.mode = config.get('MODE', 'cprofile')
+        self.sampler_interval = config.get('SAMPLER_INTERVAL', 0.005)
+        self.output_dir = config.get('OUTPUT_DIR', os.path.join(settings.BASE_DIR, 'profiles'))
+
+    def __call__(self, request):
+        requested = request.headers.get(self.header, '')
+        triggered = bool(self.secret) and hmac.compare_digest(requested.encode(), self.secret.encode())
+        if not triggered and not (self.sample_rate and random.random() < self.sample_rate):
+            return self.get_response(request)
+        if self.dump_count() >= self.max_dumps:
+            return self.get_response(request)
+
+        mode = self.mode
+        # Only one cProfile profiler may be active per process (Python 3.12+
+        # raises otherwise); a request arriving while one runs is served unprofiled
+        if mode != 'sampler' and not _cprofile_lock.acquire(blocking=False):
+            return self.get_response(request)
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        active = ExitStack()
+        if mode != 'sampler':
+            active.callback(_cprofile_lock.release)
+        active.enter_context(connection.execute_wrapper(count_queries))
+        if mode == 'sampler':
+            profiler = active.enter_context(WallClockSampler(threading.get_ident(), self.sampler_interval))
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            active.callback(profiler.disable)
+        start = time.perf_counter()
+
+        def finish():
+            active.close()
+            self.dump(request, profiler, mode, len(queries), (time.perf_counter() - start) * 1000)
+
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            finish()
+            raise
+        if response.streaming:
+            # Keep profiling until the body has been produced
+            response.streaming_content = self._finish_after(response.streaming_content, finish)
+        else:
+            finish()
+        return response
+
+    @staticmethod
+    def _finish_after(content, finish):
+        try:
+            yield from content
+        finally:
+            finish()
+
+    def dump_count(self):
+        try:
+            return len(os.listdir(self.output_dir))
+        except FileNotFoundError:
+            return 0
+
+    def dump(self, request, profiler, mode, query_count, duration_ms):
+        match = request.resolver_match
+        view_name = (match.view_name if match else 'unresolved').replace(':', '-')
+        filename = (
+            f"{view_name}.{query_count}q.{duration_ms:.0f}ms."
+            f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+            f"{'.folded' if mode == 'sampler' else '.prof'}"
+        )
+        os.makedirs(self.output_dir, exist_ok=True)
+        if mode == 'sampler':
+            profiler.dump(os.path.join(self.output_dir, filename))
+        else:
+            profiler.dump_stats(os.path.join(self.output_dir, filename))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:28
+
+import app_lms.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_lms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hash', models.CharField(max_length=64, unique=True)),
+                ('value', models.TextField()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='translation',
+            name='language',
+            field=models.CharField(choices=[('EN', 'US'), ('ES', 'ES')], max_length=2),
+        ),
+        migrations.AlterField(
+            model_name='translation',
+            name='value',
+            field=app_lms.models.DedupedTextField(),
+        ),
+        migrations.AddField(
+            model_name='translation',
+            name='value_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='translations', to='app_lms.translationvalue'),
+        ),
+    ]
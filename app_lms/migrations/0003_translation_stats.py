@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_stats(apps, schema_editor):
+    Translation = apps.get_model('app_lms', 'Translation')
+    TranslationStats = apps.get_model('app_lms', 'TranslationStats')
+    counts = (
+        Translation.objects
+        .order_by()
+        .values('site_id', 'language', 'key_type')
+        .annotate(count=Count('id'))
+    )
+    TranslationStats.objects.bulk_create(TranslationStats(**row) for row in counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_lms', '0002_translation_value_dedup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(choices=[('EN', 'US'), ('ES', 'ES')], max_length=2)),
+                ('key_type', models.CharField(choices=[('TPL', 'Template'), ('INI', 'Initialize')], max_length=3)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('site', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translation_stats', to='app_lms.site')),
+            ],
+            options={
+                'unique_together': {('site', 'language', 'key_type')},
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,11 @@
 
 # Create your models here.
+import hashlib
+
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce, NullIf
+from django.db.models.query_utils import DeferredAttribute
 
 class Site(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -8,6 +13,82 @@ class Site(models.Model):
     def __str__(self):
         return self.name
 
+class TranslationValue(models.Model):
+    """Content-addressed store for translation values shared across rows."""
+    hash = models.CharField(max_length=64, unique=True)
+    value = models.TextField()
+
+    @staticmethod
+    def digest(value):
+        return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def intern(cls, value):
+        return cls.objects.get_or_create(hash=cls.digest(value), defaults={'value': value})[0]
+
+    @classmethod
+    def intern_many(cls, values):
+        """Return {value: TranslationValue} for all values, creating missing ones."""
+        by_hash = {cls.digest(value): value for value in set(values)}
+        cls.objects.bulk_create(
+            [cls(hash=digest, value=value) for digest, value in by_hash.items()],
+            ignore_conflicts=True
+        )
+        return {
+            stored.value: stored
+            for stored in cls.objects.filter(hash__in=list(by_hash))
+        }
+
+    @classmethod
+    def release(cls, pk):
+        """Delete a stored value once no translation references it any more."""
+        cls.objects.filter(pk=pk, translations__isnull=True).delete()
+
+
+class DedupedValueDescriptor(DeferredAttribute):
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        # Deduplicated rows keep an empty column and point at the shared value
+        if instance is not None and value == '' and instance.value_ref_id is not None:
+            return instance.value_ref.value
+        return value
+
+    def __set__(self, instance, value):
+        # Being a data descriptor makes reads go through __get__
+        instance.__dict__[self.field.attname] = value
+        instance.__dict__['_value_from_db'] = False
+
+
+class DedupedTextField(models.TextField):
+    """TextField that stores an empty string when the row has a value_ref."""
+    descriptor_class = DedupedValueDescriptor
+
+    def pre_save(self, model_instance, add):
+        if model_instance.value_ref_id is not None:
+            return ''
+        return super().pre_save(model_instance, add)
+
+
+class TranslationQuerySet(models.QuerySet):
+    def with_resolved_value(self):
+        """
+        Annotate `resolved_value` with the same rule as DedupedValueDescriptor,
+        for filtering and values() on deduplicated rows, whose value column
+        is empty.
+        """
+        return self.annotate(resolved_value=Coalesce(
+            NullIf('value', models.Value('')),
+            'value_ref__value',
+            models.Value(''),
+            output_field=models.TextField(),
+        ))
+
+
+class TranslationManager(models.Manager.from_queryset(TranslationQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().select_related('value_ref')
+
+
 class Translation(models.Model):
     LANGUAGE_CHOICES = [
         ('EN', 'US'),
@@ -21,17 +102,69 @@ class Translation(models.Model):
     
     site = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='translations')
     key = models.CharField(max_length=255)
-    value = models.TextField()
+    value = DedupedTextField()
+    value_ref = models.ForeignKey(
+        TranslationValue, null=True, blank=True, on_delete=models.PROTECT, related_name='translations'
+    )
     language = models.CharField(max_length=2, choices=LANGUAGE_CHOICES)
     key_type = models.CharField(max_length=3, choices=KEY_TYPE_CHOICES)
     
+    objects = TranslationManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the counted bucket so TranslationStats can be moved on update
+        instance._stats_key = instance.stats_key()
+        # The value column has not been assigned since loading
+        instance._value_from_db = True
+        return instance
+
+    def stats_key(self):
+        data = self.__dict__
+        if not all(name in data for name in ('site_id', 'language', 'key_type')):
+            return None
+        return (data['site_id'], data['language'], data['key_type'])
+
     class Meta:
         unique_together = ('site', 'key', 'language')
     
+    @staticmethod
+    def key_type_for(key):
+        # Determine key_type based on key prefix
+        if key.startswith('//'):
+            return 'TPL'
+        if key.startswith('__'):
+            return 'INI'
+        return None
+
     def save(self, *args, **kwargs):
         # Automatically determine key_type based on key prefix
-        if self.key.startswith('//'):
-            self.key_type = 'TPL'
-        elif self.key.startswith('__'):
-            self.key_type = 'INI'
-        super().save(*args, **kwargs)
\ No newline at end of file
+        self.key_type = self.key_type_for(self.key) or self.key_type
+        # Store the value in the shared value table when deduplication is on.
+        # An assigned value is taken as is, so a deduplicated row can be set
+        # to ''; only an untouched loaded value is resolved via value_ref.
+        if 'value' not in self.__dict__ or self._value_from_db:
+            value = self.value
+        else:
+            value = self.__dict__['value']
+        previous_ref_id = self.value_ref_id
+        if getattr(settings, 'TRANSLATION_VALUE_DEDUP', False) and value:
+            self.value_ref = TranslationValue.intern(value)
+        else:
+            self.value_ref = None
+        self.value = value
+        super().save(*args, **kwargs)
+        if previous_ref_id is not None and previous_ref_id != self.value_ref_id:
+            TranslationValue.release(previous_ref_id)
+
+
+class TranslationStats(models.Model):
+    """Number of translations per site, language and key_type."""
+    site = models.ForeignKey(Site, on_delete=models.CASCADE, related_name='translation_stats')
+    language = models.CharField(max_length=2, choices=Translation.LANGUAGE_CHOICES)
+    key_type = models.CharField(max_length=3, choices=Translation.KEY_TYPE_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('site', 'language', 'key_type')
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Translation, TranslationValue
+from .stats import bump
+
+
+# Keep TranslationStats in step with single-row writes. Bulk writes and
+# QuerySet.update() bypass these; call stats.reconcile() after them.
+@receiver(post_save, sender=Translation)
+def count_saved_translation(sender, instance, created, **kwargs):
+    new_key = instance.stats_key()
+    old_key = getattr(instance, '_stats_key', None)
+    if created:
+        bump(new_key, 1)
+    elif old_key is not None and old_key != new_key:
+        bump(old_key, -1)
+        bump(new_key, 1)
+    instance._stats_key = new_key
+
+
+@receiver(post_delete, sender=Translation)
+def count_deleted_translation(sender, instance, **kwargs):
+    stats_key = getattr(instance, '_stats_key', None) or instance.stats_key()
+    if stats_key is not None:
+        bump(stats_key, -1)
+
+
+@receiver(post_delete, sender=Translation)
+def release_deleted_value(sender, instance, **kwargs):
+    if instance.value_ref_id is not None:
+        TranslationValue.release(instance.value_ref_id)
@@ -0,0 +1,63 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import Translation, TranslationStats
+
+
+def bump(stats_key, delta):
+    """Add `delta` to the counter of one (site_id, language, key_type) bucket."""
+    site_id, language, key_type = stats_key
+    counter = TranslationStats.objects.filter(site_id=site_id, language=language, key_type=key_type)
+    # Clamped at zero: a drifted counter must never make the source write fail,
+    # reconcile() repairs it
+    if counter.update(count=Greatest(F('count') + delta, 0)) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            TranslationStats.objects.create(
+                site_id=site_id, language=language, key_type=key_type, count=delta
+            )
+    except IntegrityError:
+        # Created concurrently, add to that row instead
+        counter.update(count=F('count') + delta)
+
+
+def reconcile(site_ids=None):
+    """Recompute counters from the Translation table; all sites by default."""
+    translations = Translation.objects.all()
+    stats = TranslationStats.objects.all()
+    if site_ids is not None:
+        translations = translations.filter(site_id__in=site_ids)
+        stats = stats.filter(site_id__in=site_ids)
+
+    counts = (
+        translations
+        .order_by()
+        .values('site_id', 'language', 'key_type')
+        .annotate(count=Count('id'))
+    )
+    with transaction.atomic():
+        stats.delete()
+        TranslationStats.objects.bulk_create(TranslationStats(**row) for row in counts)
+
+
+def site_stats(site_names=None):
+    """
+    Counts per site read from TranslationStats:
+    {site: {'total_keys': n, 'languages': {lang: {'TPL': n, 'INI': n, 'total': n}}}}
+    """
+    stats = TranslationStats.objects.filter(count__gt=0)
+    if site_names:
+        stats = stats.filter(site__name__in=site_names)
+
+    result = {}
+    for site_name, language, key_type, count in stats.values_list(
+        'site__name', 'language', 'key_type', 'count'
+    ):
+        site = result.setdefault(site_name, {'total_keys': 0, 'languages': {}})
+        lang = site['languages'].setdefault(language, {'TPL': 0, 'INI': 0, 'total': 0})
+        lang[key_type] = count
+        lang['total'] += count
+        site['total_keys'] += count
+    return result
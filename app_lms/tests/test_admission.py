@@ -0,0 +1,76 @@
+import threading
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.middleware import AdmissionPool, AdmissionRejected
+from app_lms.models import Site
+
+
+class AdmissionPoolTests(SimpleTestCase):
+    def test_rejects_when_queue_is_full(self):
+        """Test a request is rejected with 429 when no slot or queue space is left"""
+        pool = AdmissionPool('heavy', limit=1, queue=0, timeout=1, retry_after=5)
+        pool.acquire()
+
+        with self.assertRaises(AdmissionRejected) as ctx:
+            pool.acquire()
+        self.assertEqual(ctx.exception.status, 429)
+        self.assertEqual(ctx.exception.retry_after, 5)
+
+    def test_rejects_when_wait_times_out(self):
+        """Test a queued request is rejected with 503 after waiting too long"""
+        pool = AdmissionPool('heavy', limit=1, queue=1, timeout=0.01, retry_after=5)
+        pool.acquire()
+
+        with self.assertRaises(AdmissionRejected) as ctx:
+            pool.acquire()
+        self.assertEqual(ctx.exception.status, 503)
+
+    def test_waiter_is_admitted_on_release(self):
+        """Test a queued request gets the slot once it is released"""
+        pool = AdmissionPool('heavy', limit=1, queue=1, timeout=5, retry_after=5)
+        pool.acquire()
+        admitted = threading.Event()
+
+        def waiter():
+            pool.acquire()
+            admitted.set()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        pool.release()
+        thread.join()
+
+        self.assertTrue(admitted.is_set())
+
+
+@override_settings(ADMISSION_CONTROL={
+    'heavy': {'LIMIT': 0, 'QUEUE': 0, 'TIMEOUT': 0, 'RETRY_AFTER': 7},
+    'light': {'LIMIT': 1, 'QUEUE': 0, 'TIMEOUT': 0, 'RETRY_AFTER': 1},
+})
+class AdmissionControlMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        Site.objects.create(name="site1")
+
+    def test_heavy_route_rejected_when_full(self):
+        """Test the export is rejected with Retry-After when the heavy pool is full"""
+        response = self.client.get(reverse('translations'), data={'site': 'site1'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '7')
+
+    def test_coverage_summary_uses_heavy_pool(self):
+        """Test the coverage summary is admitted through the heavy pool"""
+        response = self.client.get(reverse('coverage'))
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_light_route_unaffected(self):
+        """Test light routes keep being served while the heavy pool is full"""
+        for _ in range(3):
+            response = self.client.get(reverse('sites'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
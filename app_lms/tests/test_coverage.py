@@ -0,0 +1,82 @@
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.coverage import coverage_summary, missing_keys
+from app_lms.models import Site, Translation
+
+
+class CoverageTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.site1 = Site.objects.create(name="site1")
+        self.site2 = Site.objects.create(name="site2")
+
+        Translation.objects.create(site=self.site1, language="EN", key="__title", value="Title")
+        Translation.objects.create(site=self.site1, language="EN", key="//footer", value="Footer")
+        Translation.objects.create(site=self.site1, language="ES", key="__title", value="Titulo")
+        Translation.objects.create(site=self.site2, language="ES", key="__hello", value="Hola")
+
+    def test_missing_keys_anti_join(self):
+        """Test keys present in one language but absent in the other"""
+        self.assertEqual(list(missing_keys("EN", "ES")), [("site1", "//footer")])
+        self.assertEqual(list(missing_keys("ES", "EN")), [("site2", "__hello")])
+        self.assertEqual(list(missing_keys("ES", "EN", ["site1"])), [])
+
+    def test_coverage_summary(self):
+        """Test per-language completion percentages for every site"""
+        summary = {row['site']: row for row in coverage_summary()}
+
+        self.assertEqual(summary['site1']['total_keys'], 2)
+        self.assertEqual(summary['site1']['languages']['EN']['completion'], 100.0)
+        self.assertEqual(summary['site1']['languages']['ES']['completion'], 50.0)
+        self.assertEqual(summary['site1']['languages']['ES']['missing'], 1)
+        self.assertEqual(summary['site2']['languages']['EN']['keys'], 0)
+
+    def test_coverage_summary_is_cached(self):
+        """Test the summary is served from cache on subsequent calls"""
+        coverage_summary()
+        with self.assertNumQueries(0):
+            coverage_summary()
+
+    def test_coverage_endpoint(self):
+        """Test the coverage summary endpoint"""
+        response = self.client.get(reverse('coverage'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['site'] for row in response.data], ['site1', 'site2'])
+
+    def test_missing_keys_endpoint_streams_ndjson(self):
+        """Test the missing keys endpoint streams one JSON row per key"""
+        response = self.client.get(reverse('coverage-missing'), {'source': 'EN', 'target': 'ES'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(rows, [{"site": "site1", "key": "//footer", "present": "EN", "missing": "ES"}])
+
+    def test_missing_keys_endpoint_unknown_language(self):
+        """Test an unknown language is rejected"""
+        response = self.client.get(reverse('coverage-missing'), {'source': 'FR'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_missing_keys_endpoint_same_language(self):
+        """Test identical source and target languages are rejected like the command does"""
+        response = self.client.get(reverse('coverage-missing'), {'source': 'EN', 'target': 'EN'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_coverage_command(self):
+        """Test the coverage management command output"""
+        out = StringIO()
+        call_command('translation_coverage', '--missing', stdout=out)
+
+        self.assertIn("site1\t//footer\tEN->ES", out.getvalue())
+        self.assertIn("site2\t__hello\tES->EN", out.getvalue())
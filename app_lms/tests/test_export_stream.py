@@ -0,0 +1,104 @@
+import gzip
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.models import Site, Translation
+
+
+class StreamingExportTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.site1 = Site.objects.create(name="site1")
+        self.site2 = Site.objects.create(name="site2")
+
+        Translation.objects.create(site=self.site1, language="EN", key="__title", value="Title")
+        Translation.objects.create(site=self.site1, language="EN", key="//footer", value="Footer")
+        Translation.objects.create(site=self.site1, language="ES", key="__title", value="Titulo")
+        Translation.objects.create(site=self.site2, language="ES", key="__hello", value="Hola")
+
+    def export(self, **data):
+        # The export reads its parameters from the request body
+        response = self.client.generic(
+            'GET', reverse('translations'), json.dumps(data), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response
+
+    def lines(self, content):
+        return [json.loads(line) for line in content.splitlines()]
+
+    def test_ndjson_rows(self):
+        """Test the NDJSON export streams one row per translation"""
+        response = self.export(site="site1", export_format="ndjson")
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = self.lines(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(
+            rows[0],
+            {"site": "site1", "language": "EN", "key_type": "TPL", "key": "//footer", "value": "Footer"}
+        )
+
+    def test_query_string_parameters(self):
+        """Test the stream can be requested without a GET body"""
+        response = self.client.get(reverse('translations'), {'site': 'site2', 'export_format': 'ndjson'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = self.lines(b''.join(response.streaming_content))
+        self.assertEqual([(row["site"], row["key"]) for row in rows], [("site2", "__hello")])
+
+    def test_json_objects_per_site_and_language(self):
+        """Test the JSON export streams one object per site and language"""
+        response = self.export(site="site1,site2", export_format="json")
+
+        objects = self.lines(b''.join(response.streaming_content))
+        self.assertEqual([(o["site"], o["language"]) for o in objects], [
+            ("site1", "EN"), ("site1", "ES"), ("site2", "ES")
+        ])
+        self.assertEqual(objects[0]["translations"], {"TPL": {"//footer": "Footer"}, "INI": {"__title": "Title"}})
+
+    def test_json_objects_unprefixed_key(self):
+        """Test keys without a TPL/INI prefix are grouped with INI"""
+        Translation.objects.bulk_create([
+            Translation(site=self.site2, language="ES", key="plain", value="Plano", key_type="")
+        ])
+
+        response = self.export(site="site2", export_format="json")
+
+        objects = self.lines(b''.join(response.streaming_content))
+        self.assertEqual(objects[0]["translations"]["INI"], {"__hello": "Hola", "plain": "Plano"})
+
+    def test_gzip(self):
+        """Test the stream can be gzip compressed"""
+        response = self.export(site="site2", export_format="ndjson", gzip=True)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        rows = self.lines(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual([row["key"] for row in rows], ["__hello"])
+
+    @override_settings(TRANSLATION_VALUE_DEDUP=True)
+    def test_deduplicated_values(self):
+        """Test values stored in the shared value table are exported"""
+        Translation.objects.create(site=self.site2, language="EN", key="__hello", value="Hello")
+
+        response = self.export(site="site2", export_format="ndjson")
+
+        rows = self.lines(b''.join(response.streaming_content))
+        self.assertEqual([row["value"] for row in rows], ["Hello", "Hola"])
+
+    @override_settings(TRANSLATION_VALUE_DEDUP=True)
+    def test_inline_value_overrides_shared_value(self):
+        """Test the stream shows an inline value written over a deduplicated row"""
+        Translation.objects.create(site=self.site2, language="EN", key="__hello", value="Hello")
+        Translation.objects.filter(site=self.site2, language="EN").update(value="Hi")
+
+        response = self.export(site="site2", export_format="ndjson")
+
+        rows = self.lines(b''.join(response.streaming_content))
+        self.assertEqual([row["value"] for row in rows], ["Hi", "Hola"])
+        self.assertEqual(Translation.objects.get(site=self.site2, language="EN").value, "Hi")
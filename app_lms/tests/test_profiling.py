@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.middleware import _cprofile_lock
+from app_lms.models import Site
+
+
+class ProfilingMiddlewareTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.output_dir = tempfile.mkdtemp()
+        Site.objects.create(name="site1")
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def profiling(self, **options):
+        config = {'ENABLED': True, 'SECRET': 's3cret', 'OUTPUT_DIR': self.output_dir}
+        config.update(options)
+        return override_settings(REQUEST_PROFILING=config)
+
+    def test_untriggered_request_is_not_profiled(self):
+        """Test requests without the header are not profiled"""
+        with self.profiling():
+            response = self.client.get(reverse('sites'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_header_requires_secret(self):
+        """Test the header only triggers profiling with the configured secret"""
+        with self.profiling():
+            self.client.get(reverse('sites'), HTTP_X_PROFILE='1')
+        with self.profiling(SECRET=''):
+            self.client.get(reverse('sites'), HTTP_X_PROFILE='')
+
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_dumps_are_capped(self):
+        """Test no more dumps are written once MAX_DUMPS is reached"""
+        with self.profiling(MAX_DUMPS=2):
+            for _ in range(3):
+                self.client.get(reverse('sites'), HTTP_X_PROFILE='s3cret')
+
+        self.assertEqual(len(os.listdir(self.output_dir)), 2)
+
+    def test_header_triggers_cprofile_dump(self):
+        """Test the header writes a .prof file named after view, queries and duration"""
+        with self.profiling():
+            response = self.client.get(reverse('sites'), HTTP_X_PROFILE='s3cret')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        files = os.listdir(self.output_dir)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith('sites.1q.'))
+        self.assertTrue(files[0].endswith('.prof'))
+
+    def test_concurrent_cprofile_request_served_unprofiled(self):
+        """Test a request is not profiled while another cProfile run is active"""
+        with _cprofile_lock, self.profiling():
+            response = self.client.get(reverse('sites'), HTTP_X_PROFILE='s3cret')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+        with self.profiling():
+            self.client.get(reverse('sites'), HTTP_X_PROFILE='s3cret')
+        self.assertEqual(len(os.listdir(self.output_dir)), 1)
+
+    def test_sampler_writes_folded_stacks(self):
+        """Test the wall-clock sampler writes flamegraph collapsed stacks"""
+        with self.profiling(MODE='sampler', SAMPLER_INTERVAL=0.0001):
+            self.client.get(reverse('sites'), HTTP_X_PROFILE='s3cret')
+
+        files = os.listdir(self.output_dir)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith('.folded'))
+
+    def test_sample_rate_triggers_profile(self):
+        """Test requests are profiled by sampling rate without the header"""
+        with self.profiling(SAMPLE_RATE=1.0):
+            self.client.get(reverse('sites'))
+
+        self.assertEqual(len(os.listdir(self.output_dir)), 1)
+
+    def test_streaming_response_profiled_until_exhausted(self):
+        """Test queries run while streaming the body are counted"""
+        with self.profiling():
+            response = self.client.get(
+                reverse('translations'), {'site': 'site1', 'export_format': 'ndjson'}, HTTP_X_PROFILE='s3cret'
+            )
+            self.assertEqual(os.listdir(self.output_dir), [])
+            b''.join(response.streaming_content)
+
+        files = os.listdir(self.output_dir)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].startswith('translations.1q.'))
@@ -0,0 +1,120 @@
+import json
+import os
+import zipfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.models import Site, Translation, TranslationStats
+from app_lms.stats import site_stats
+
+
+class TranslationStatsTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.site1 = Site.objects.create(name="site1")
+        self.site2 = Site.objects.create(name="site2")
+
+        self.title = Translation.objects.create(site=self.site1, language="EN", key="__title", value="Title")
+        Translation.objects.create(site=self.site1, language="EN", key="//footer", value="Footer")
+        Translation.objects.create(site=self.site1, language="ES", key="__title", value="Titulo")
+        Translation.objects.create(site=self.site2, language="ES", key="__hello", value="Hola")
+
+    def count(self, site, language, key_type):
+        stats = TranslationStats.objects.filter(site=site, language=language, key_type=key_type).first()
+        return stats.count if stats else 0
+
+    def test_insert_increments(self):
+        """Test counters follow inserted translations"""
+        self.assertEqual(self.count(self.site1, "EN", "INI"), 1)
+        self.assertEqual(self.count(self.site1, "EN", "TPL"), 1)
+        self.assertEqual(self.count(self.site1, "ES", "INI"), 1)
+        self.assertEqual(self.count(self.site2, "ES", "INI"), 1)
+
+    def test_update_moves_count(self):
+        """Test changing language moves the row to the other counter"""
+        translation = Translation.objects.get(pk=self.title.pk)
+        translation.language = "ES"
+        translation.key = "__subtitle"
+        translation.save()
+
+        self.assertEqual(self.count(self.site1, "EN", "INI"), 0)
+        self.assertEqual(self.count(self.site1, "ES", "INI"), 2)
+
+    def test_update_value_keeps_count(self):
+        """Test saving without moving buckets leaves counters alone"""
+        self.title.value = "New title"
+        self.title.save()
+
+        self.assertEqual(self.count(self.site1, "EN", "INI"), 1)
+
+    def test_delete_decrements(self):
+        """Test deleting translations decrements counters"""
+        Translation.objects.filter(site=self.site1, language="EN").delete()
+
+        self.assertEqual(self.count(self.site1, "EN", "INI"), 0)
+        self.assertEqual(self.count(self.site1, "EN", "TPL"), 0)
+        self.assertEqual(self.count(self.site1, "ES", "INI"), 1)
+
+    def test_delete_with_drifted_counter(self):
+        """Test deleting rows the counters missed does not fail or go negative"""
+        site3 = Site.objects.create(name="site3")
+        Translation.objects.create(site=site3, language="EN", key="__one", value="One")
+        Translation.objects.bulk_create([
+            Translation(site=site3, language="EN", key="__two", value="Two", key_type="INI")
+        ])
+
+        Translation.objects.filter(site=site3).delete()
+
+        self.assertFalse(Translation.objects.filter(site=site3).exists())
+        self.assertEqual(self.count(site3, "EN", "INI"), 0)
+
+    def test_reconcile_command(self):
+        """Test the reconcile command repairs drifted counters"""
+        TranslationStats.objects.all().update(count=42)
+
+        call_command('reconcile_translation_stats', stdout=StringIO())
+
+        self.assertEqual(self.count(self.site1, "EN", "INI"), 1)
+        self.assertEqual(self.count(self.site2, "ES", "INI"), 1)
+
+    def test_site_stats_reads_counters_only(self):
+        """Test per-site counts are served in one query"""
+        with self.assertNumQueries(1):
+            stats = site_stats()
+
+        self.assertEqual(stats["site1"]["total_keys"], 3)
+        self.assertEqual(stats["site1"]["languages"]["EN"], {"TPL": 1, "INI": 1, "total": 2})
+
+    def test_stats_endpoint(self):
+        """Test the stats endpoint filters by site"""
+        response = self.client.get(reverse('stats'), {'site': 'site2'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data), ["site2"])
+        self.assertEqual(response.data["site2"]["total_keys"], 1)
+
+    def test_export_includes_rows_missing_from_stats(self):
+        """Test rows written without signals are exported and counted in the header"""
+        site3 = Site.objects.create(name="site3")
+        Translation.objects.create(site=site3, language="EN", key="__orm", value="Orm")
+        Translation.objects.bulk_create([
+            Translation(site=site3, language="EN", key="__bulk", value="Bulk", key_type="INI")
+        ])
+
+        response = self.client.generic(
+            'GET', reverse('translations'), json.dumps({'site': 'site3'}), content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        zip_filepath = os.path.join(settings.MEDIA_ROOT, 'translation_exports', 'sites.zip')
+        with zipfile.ZipFile(zip_filepath) as zip_file:
+            content = zip_file.read("site3/en-EN.ini").decode()
+        self.assertIn("__bulk=Bulk", content)
+        # The header counts the rows in the file, not the (drifted) counters
+        self.assertIn("# Total Keys: 2\n", content)
+        os.remove(zip_filepath)
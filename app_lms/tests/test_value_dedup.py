@@ -0,0 +1,135 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.models import Site, Translation, TranslationValue
+from app_lms.serializers import TranslationSerializer
+
+
+@override_settings(TRANSLATION_VALUE_DEDUP=True)
+class TranslationValueDedupTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.site1 = Site.objects.create(name="site1")
+        self.site2 = Site.objects.create(name="site2")
+
+    def test_identical_values_are_stored_once(self):
+        """Test identical values across sites share one stored value"""
+        Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=self.site2, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=self.site2, language="EN", key="//submit", value="Save")
+
+        self.assertEqual(TranslationValue.objects.count(), 1)
+        self.assertEqual(Translation.objects.filter(value='').count(), 3)
+        self.assertEqual(
+            [t.value for t in Translation.objects.order_by('pk')],
+            ["Save", "Save", "Save"]
+        )
+
+    def test_lookup_loads_values_without_extra_queries(self):
+        """Test shared values are joined in rather than fetched per row"""
+        Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=self.site1, language="ES", key="__save", value="Guardar")
+
+        with self.assertNumQueries(1):
+            values = sorted(t.value for t in Translation.objects.filter(site=self.site1))
+        self.assertEqual(values, ["Guardar", "Save"])
+
+    def test_resolved_value_for_filter_and_values(self):
+        """Test deduplicated values can be filtered on and selected"""
+        Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=self.site1, language="ES", key="__save", value="Guardar")
+
+        translations = Translation.objects.with_resolved_value()
+        self.assertEqual(
+            list(translations.filter(resolved_value="Save").values_list('language', flat=True)),
+            ["EN"]
+        )
+        self.assertEqual(
+            sorted(translations.values_list('resolved_value', flat=True)),
+            ["Guardar", "Save"]
+        )
+
+    def test_serializer_is_transparent(self):
+        """Test the serializer reads and writes deduplicated values as before"""
+        serializer = TranslationSerializer(
+            data={"site": "site1", "key": "__save", "value": "Save", "language": "EN"}
+        )
+        self.assertTrue(serializer.is_valid())
+        translation = serializer.save()
+
+        self.assertIsNotNone(translation.value_ref)
+        self.assertEqual(TranslationSerializer(Translation.objects.get()).data["value"], "Save")
+
+    def test_changing_value_updates_reference(self):
+        """Test saving a new value points the row at the new shared value"""
+        translation = Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+        translation.value = "Store"
+        translation.save()
+
+        self.assertEqual(Translation.objects.get().value, "Store")
+
+    def test_changed_or_deleted_value_releases_unused_shared_value(self):
+        """Test shared values are deleted once nothing references them"""
+        translation = Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=self.site2, language="EN", key="__save", value="Save")
+        translation.value = "Store"
+        translation.save()
+
+        self.assertEqual(sorted(TranslationValue.objects.values_list('value', flat=True)), ["Save", "Store"])
+
+        Translation.objects.filter(site=self.site2).delete()
+        self.assertEqual(list(TranslationValue.objects.values_list('value', flat=True)), ["Store"])
+
+        Translation.objects.get(pk=translation.pk).delete()
+        self.assertFalse(TranslationValue.objects.exists())
+
+    def test_deduplicated_value_can_be_cleared(self):
+        """Test a deduplicated row can be set to an empty value"""
+        Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+        translation = Translation.objects.get()
+        translation.value = ""
+        translation.save()
+
+        stored = Translation.objects.get()
+        self.assertEqual(stored.value, "")
+        self.assertIsNone(stored.value_ref)
+        self.assertFalse(TranslationValue.objects.exists())
+
+    def test_export_reads_deduplicated_values(self):
+        """Test the export endpoint still works with deduplicated rows"""
+        Translation.objects.create(site=self.site1, language="EN", key="__save", value="Save")
+
+        response = self.client.get(reverse('translations'), data={'site': 'site1'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class DedupeCommandTests(APITestCase):
+    def setUp(self):
+        site1 = Site.objects.create(name="site1")
+        site2 = Site.objects.create(name="site2")
+        Translation.objects.create(site=site1, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=site2, language="EN", key="__save", value="Save")
+        Translation.objects.create(site=site2, language="ES", key="__save", value="Guardar")
+
+    def test_dedupe_and_inflate_round_trip(self):
+        """Test existing rows are moved into the value table and back"""
+        call_command('dedupe_translation_values', stdout=StringIO())
+
+        self.assertEqual(TranslationValue.objects.count(), 2)
+        self.assertFalse(Translation.objects.filter(value_ref__isnull=True).exists())
+        self.assertEqual(Translation.objects.filter(value='').count(), 3)
+        self.assertEqual(sorted(t.value for t in Translation.objects.all()), ["Guardar", "Save", "Save"])
+
+        call_command('dedupe_translation_values', '--inflate', stdout=StringIO())
+
+        self.assertEqual(TranslationValue.objects.count(), 0)
+        self.assertEqual(
+            sorted(Translation.objects.values_list('value', flat=True)),
+            ["Guardar", "Save", "Save"]
+        )
@@ -0,0 +1,160 @@
+from unittest.mock import patch
+
+from django.db import IntegrityError, OperationalError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APIClient
+
+from app_lms.models import Site, Translation, TranslationStats
+from app_lms.serializers import TranslationSerializer
+from app_lms.write_behind import WriteBehindQueue
+
+
+class WriteBehindQueueTests(APITestCase):
+    def setUp(self):
+        self.site1 = Site.objects.create(name="site1")
+        self.queue = WriteBehindQueue(interval_ms=10, batch_size=2)
+
+    def put(self, key, value, language="EN"):
+        serializer = TranslationSerializer(
+            data={"site": "site1", "key": key, "value": value, "language": language}
+        )
+        serializer.is_valid(raise_exception=True)
+        self.queue.put(serializer.validated_data)
+
+    def test_flush_writes_queued_translations(self):
+        """Test queued payloads are written in batches with key_type set"""
+        self.put("__title", "Title")
+        self.put("//footer", "Footer")
+        self.put("__title", "Titulo", language="ES")
+
+        self.assertEqual(self.queue.flush(), 3)
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertEqual(Translation.objects.count(), 3)
+        self.assertEqual(Translation.objects.get(key="//footer").key_type, "TPL")
+        self.assertEqual(Translation.objects.get(key="__title", language="ES").key_type, "INI")
+
+    def test_first_write_wins(self):
+        """Test duplicates queued before the first write are dropped"""
+        self.put("__title", "First")
+        self.put("__title", "Second")
+        self.put("__title", "Third")
+
+        self.queue.flush()
+
+        self.assertEqual(Translation.objects.get(key="__title").value, "First")
+
+    def test_flush_bumps_stats_for_new_rows_only(self):
+        """Test counters are bumped by the rows a flush actually inserted"""
+        Translation.objects.create(site=self.site1, language="EN", key="__title", value="Title")
+        self.put("//footer", "Footer")
+        self.put("__body", "Body")
+        self.put("__body", "Body again")
+        # Validated earlier, conflicts with the row written above
+        self.queue.put({"site": self.site1, "key": "__title", "value": "Again", "language": "EN"})
+
+        with CaptureQueriesContext(connection) as queries:
+            self.queue.flush()
+
+        self.assertFalse(any('COUNT' in q['sql'] or 'DELETE' in q['sql'] for q in queries))
+        stats = {
+            (s.language, s.key_type): s.count
+            for s in TranslationStats.objects.filter(site=self.site1)
+        }
+        self.assertEqual(stats, {("EN", "INI"): 2, ("EN", "TPL"): 1})
+
+    def test_failing_row_does_not_drop_batch(self):
+        """Test a batch that fails is retried row by row"""
+        self.put("__title", "Title")
+        self.put("__broken", "Broken")
+        self.put("//footer", "Footer")
+        write = self.queue._write
+
+        def failing_write(batch):
+            if any(data["key"] == "__broken" for data in batch):
+                raise IntegrityError("FOREIGN KEY constraint failed")
+            write(batch)
+
+        with patch.object(self.queue, '_write', side_effect=failing_write), \
+                self.assertLogs('app_lms.write_behind', level='ERROR'):
+            self.queue.flush()
+
+        self.assertEqual(
+            sorted(Translation.objects.values_list('key', flat=True)), ["//footer", "__title"]
+        )
+
+    def test_transient_errors_are_retried(self):
+        """Test operational errors such as a locked database are retried"""
+        self.put("__title", "Title")
+        write = self.queue._write
+        attempts = []
+
+        def locked_once(batch):
+            attempts.append(batch)
+            if len(attempts) == 1:
+                raise OperationalError("database is locked")
+            write(batch)
+
+        with patch.object(self.queue, '_write', side_effect=locked_once):
+            self.queue.flush()
+
+        self.assertEqual(len(attempts), 2)
+        self.assertTrue(Translation.objects.filter(key="__title").exists())
+
+    def test_zero_retries_still_writes(self):
+        """Test a retry setting of 0 still makes one attempt"""
+        write_queue = WriteBehindQueue(interval_ms=10, batch_size=2, retries=0)
+        serializer = TranslationSerializer(
+            data={"site": "site1", "key": "__title", "value": "Title", "language": "EN"}
+        )
+        serializer.is_valid(raise_exception=True)
+        write_queue.put(serializer.validated_data)
+
+        write_queue.flush()
+
+        self.assertTrue(Translation.objects.filter(key="__title").exists())
+
+    def test_take_respects_limit(self):
+        """Test topping up a batch never goes past batch_size"""
+        for i in range(5):
+            self.queue.put({"key": f"__k{i}"})
+
+        batch = self.queue._take(block=True, limit=1)
+        batch += self.queue._take(block=False, limit=self.queue.batch_size - len(batch))
+
+        self.assertEqual(len(batch), self.queue.batch_size)
+        self.assertEqual(self.queue.pending(), 3)
+
+
+class WriteBehindViewTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.site1 = Site.objects.create(name="site1")
+
+    @override_settings(TRANSLATION_WRITE_BEHIND=True)
+    @patch('app_lms.views.get_queue')
+    def test_post_is_queued(self, mock_get_queue):
+        """Test a valid POST is queued and accepted without writing"""
+        translation_data = {"site": "site1", "key": "__title", "value": "Title", "language": "EN"}
+
+        response = self.client.post(reverse('translations'), translation_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["site"], "site1")
+        self.assertEqual(Translation.objects.count(), 0)
+        queued = mock_get_queue.return_value.put.call_args[0][0]
+        self.assertEqual(queued["site"], self.site1)
+        self.assertEqual(queued["key"], "__title")
+
+    @override_settings(TRANSLATION_WRITE_BEHIND=True)
+    @patch('app_lms.views.get_queue')
+    def test_invalid_post_is_not_queued(self, mock_get_queue):
+        """Test invalid payloads are rejected before reaching the queue"""
+        translation_data = {"site": "site1", "key": "title", "value": "Title", "language": "EN"}
+
+        response = self.client.post(reverse('translations'), translation_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_get_queue.assert_not_called()
@@ -1,7 +1,10 @@
 from django.urls import path
-from .views import TranslationView, SiteView
+from .views import TranslationView, SiteView, CoverageView, MissingKeysView, StatsView
 
 urlpatterns = [
     path('sites/', SiteView.as_view(), name='sites'),
     path('translations/', TranslationView.as_view(), name='translations'),
+    path('coverage/', CoverageView.as_view(), name='coverage'),
+    path('coverage/missing/', MissingKeysView.as_view(), name='coverage-missing'),
+    path('stats/', StatsView.as_view(), name='stats'),
 ]
\ No newline at end of file
@@ -1,17 +1,17 @@
-from django.shortcuts import render
-
 # Create your views here.
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from .models import Site, Translation
 from .serializers import TranslationSerializer,SiteSerializer
-import io
-import zipfile
-from datetime import datetime
+from .coverage import LANGUAGES, coverage_summary, language_pairs, missing_keys
+from .write_behind import get_queue
+from .stats import site_stats
+from .export import STREAM_FORMATS, gzip_stream, json_objects, ndjson_rows, translation_rows
 from django.conf import settings
 import os
+import json
 
 
 
@@ -29,20 +29,36 @@ class SiteView(APIView):
         return Response(serializer.data)
 
 class TranslationView(APIView):
+    # Exports run in the heavy admission pool, see app_lms/middleware.py
+    admission_pools = {'get': 'heavy'}
+
     def post(self, request):
         serializer = TranslationSerializer(data=request.data)
         if serializer.is_valid():
+            if getattr(settings, 'TRANSLATION_WRITE_BEHIND', False):
+                # Queued for the background writer, see app_lms/write_behind.py
+                get_queue().put(serializer.validated_data)
+                return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     def get(self, request):
         try:
-            # Split the sites string into a list
-            site_names = request.data.get('site', '').split(',')
+            # Split the sites string into a list (body first, then query string)
+            site_names = request.data.get('site', request.query_params.get('site', '')).split(',')
             # if not site_names:
             #     return Response({"error": "No sites provided"}, status=status.HTTP_404_NOT_FOUND)
 
+            # NDJSON / JSON exports are streamed instead of written to the zip
+            export_format = request.data.get('export_format', request.query_params.get('export_format', 'zip'))
+            if export_format in STREAM_FORMATS:
+                return self.stream(request, site_names, export_format)
+
+            # Only needed by the zip export, imported here to keep worker start-up lean
+            import zipfile
+            from datetime import datetime
+
             # Create directory for storing zip files if it doesn't exist
             upload_dir = os.path.join(settings.MEDIA_ROOT, 'translation_exports')
             os.makedirs(upload_dir, exist_ok=True)
@@ -118,3 +134,67 @@ class TranslationView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def stream(self, request, site_names, export_format):
+        # Rows are encoded as they come off the DB cursor, nothing is buffered
+        site_names = [name.strip() for name in site_names if name.strip()]
+        rows = translation_rows(site_names)
+        content = ndjson_rows(rows) if export_format == 'ndjson' else json_objects(rows)
+
+        use_gzip = str(request.data.get('gzip', request.query_params.get('gzip', ''))).lower() in ('1', 'true')
+        if use_gzip:
+            content = gzip_stream(content)
+
+        response = StreamingHttpResponse(content, content_type='application/x-ndjson')
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+        return response
+
+
+class CoverageView(APIView):
+    # A cache miss aggregates over every site and translation
+    admission_pools = {'get': 'heavy'}
+
+    def get(self, request):
+        return Response(coverage_summary())
+
+
+class MissingKeysView(APIView):
+    admission_pools = {'get': 'heavy'}
+
+    def get(self, request):
+        source = request.query_params.get('source')
+        target = request.query_params.get('target')
+        for lang in (source, target):
+            if lang is not None and lang not in LANGUAGES:
+                return Response(
+                    {"error": f"Unknown language '{lang}'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        sites = request.query_params.get('site', '')
+        site_names = [name.strip() for name in sites.split(',') if name.strip()]
+        pairs = language_pairs(source, target)
+        if not pairs:
+            return Response(
+                {"error": "Source and target languages must differ"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        def rows():
+            for src, dst in pairs:
+                for site_name, key in missing_keys(src, dst, site_names):
+                    yield json.dumps({
+                        "site": site_name,
+                        "key": key,
+                        "present": src,
+                        "missing": dst
+                    }) + "\n"
+
+        return StreamingHttpResponse(rows(), content_type='application/x-ndjson')
+
+
+class StatsView(APIView):
+    def get(self, request):
+        sites = request.query_params.get('site', '')
+        site_names = [name.strip() for name in sites.split(',') if name.strip()]
+        return Response(site_stats(site_names))
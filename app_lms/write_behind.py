@@ -0,0 +1,189 @@
+"""
+Write-behind group commit for single translation POSTs.
+
+When TRANSLATION_WRITE_BEHIND is enabled, TranslationView.post validates the
+payload, puts it on an in-process queue and answers 202 Accepted. A single
+background writer drains the queue every TRANSLATION_WRITE_BEHIND_INTERVAL_MS
+milliseconds, or as soon as TRANSLATION_WRITE_BEHIND_BATCH_SIZE rows are
+waiting, and writes each batch as one multi-row INSERT (ON CONFLICT DO
+NOTHING) in a single transaction.
+
+Durability: a 202 only means the payload was validated and queued. Queued
+rows live in process memory and are lost if the process dies before the next
+flush; a clean interpreter exit flushes what is left. Rows can also be lost
+after the 202 when writing them fails:
+
+* a batch that fails on a row (e.g. its site was deleted after validation)
+  is retried row by row, so only the failing rows are dropped and logged;
+* a batch that keeps hitting database errors such as "database is locked"
+  is retried TRANSLATION_WRITE_BEHIND_RETRIES times with back-off and then
+  dropped and logged as a whole.
+
+Producers that need a committed write must keep write-behind disabled.
+
+Ordering: payloads are written in the order they were accepted by this
+process. The serializer only accepts keys that do not exist yet, so, as with
+sequential POSTs, the first accepted payload for a (site, key, language) is
+the one stored; later duplicates that were queued before it was written are
+dropped instead of answered with 400. There is no ordering across worker
+processes.
+"""
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+
+from .models import Translation, TranslationValue
+from .stats import bump
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    def __init__(self, interval_ms=50, batch_size=500, retries=3):
+        self.interval = interval_ms / 1000.0
+        self.batch_size = batch_size
+        # At least one attempt, or nothing would ever be written
+        self.retries = max(1, retries)
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def put(self, validated_data):
+        self._queue.put(dict(validated_data))
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='translation-write-behind', daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def flush(self):
+        """Write everything currently queued; returns the number of payloads."""
+        written = 0
+        while True:
+            batch = self._take(block=False)
+            if not batch:
+                return written
+            self._write_safely(batch)
+            written += len(batch)
+
+    def _take(self, block, limit=None):
+        limit = self.batch_size if limit is None else limit
+        batch = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self.interval))
+            while len(batch) < limit:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _run(self):
+        try:
+            while not self._stopping.is_set():
+                batch = self._take(block=True)
+                if len(batch) < self.batch_size and not self._stopping.is_set():
+                    # Give the batch the rest of the interval to fill up
+                    self._stopping.wait(self.interval)
+                    batch += self._take(block=False, limit=self.batch_size - len(batch))
+                if batch:
+                    self._write_safely(batch)
+        finally:
+            connections.close_all()
+
+    def _write_safely(self, batch):
+        error = None
+        for attempt in range(1, self.retries + 1):
+            try:
+                self._write(batch)
+                return
+            except OperationalError:
+                # Usually transient (locked database, lost connection)
+                if attempt == self.retries:
+                    logger.exception("Dropped %d queued translations", len(batch))
+                    return
+                time.sleep(self.interval * attempt)
+            except Exception as e:
+                error = e
+                break
+
+        if len(batch) == 1:
+            logger.error("Dropped queued translation %s", batch[0].get('key'), exc_info=error)
+            return
+        # Split so that one bad row does not take the rest of the batch with it
+        for data in batch:
+            self._write_safely([data])
+
+    def _write(self, batch):
+        rows = {}
+        for data in batch:
+            translation = Translation(**data)
+            translation.key_type = Translation.key_type_for(translation.key)
+            rows.setdefault((translation.site.pk, translation.key, translation.language), translation)
+
+        with transaction.atomic():
+            # bulk_create skips Translation.save(), so intern values here
+            if getattr(settings, 'TRANSLATION_VALUE_DEDUP', False):
+                stored = TranslationValue.intern_many(t.value for t in rows.values() if t.value)
+                for translation in rows.values():
+                    translation.value_ref = stored.get(translation.value)
+            # bulk_create sends no signals and ignores conflicts silently, so
+            # find the rows that already exist to count only the new ones
+            existing = set(
+                Translation.objects
+                .filter(
+                    site_id__in={site_id for site_id, _, _ in rows},
+                    key__in={key for _, key, _ in rows},
+                    language__in={language for _, _, language in rows},
+                )
+                .values_list('site_id', 'key', 'language')
+            )
+            Translation.objects.bulk_create(list(rows.values()), ignore_conflicts=True)
+
+            added = Counter(
+                translation.stats_key()
+                for row_key, translation in rows.items()
+                if row_key not in existing
+            )
+            for stats_key, count in added.items():
+                bump(stats_key, count)
+
+
+_default_queue = None
+_default_lock = threading.Lock()
+
+
+def get_queue():
+    """The process-wide queue, started on first use."""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            _default_queue = WriteBehindQueue(
+                interval_ms=getattr(settings, 'TRANSLATION_WRITE_BEHIND_INTERVAL_MS', 50),
+                batch_size=getattr(settings, 'TRANSLATION_WRITE_BEHIND_BATCH_SIZE', 500),
+                retries=getattr(settings, 'TRANSLATION_WRITE_BEHIND_RETRIES', 3),
+            )
+            atexit.register(_default_queue.stop)
+        _default_queue.start()
+        return _default_queue
@@ -51,6 +51,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'app_lms.middleware.AdmissionControlMiddleware',
+    'app_lms.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'lms_demo.urls'
@@ -125,3 +127,42 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Seconds the per-site translation coverage summary is cached for
+TRANSLATION_COVERAGE_CACHE_TIMEOUT = 60
+
+# Queue single translation POSTs and write them in grouped inserts from a
+# background thread. Accepted rows are only in memory until flushed, see
+# app_lms/write_behind.py for the durability and ordering guarantees.
+TRANSLATION_WRITE_BEHIND = False
+TRANSLATION_WRITE_BEHIND_INTERVAL_MS = 50
+TRANSLATION_WRITE_BEHIND_BATCH_SIZE = 500
+TRANSLATION_WRITE_BEHIND_RETRIES = 3
+
+# Concurrency limits per pool of API views (see app_lms/middleware.py).
+# LIMIT requests run at once, QUEUE more wait up to TIMEOUT seconds; beyond
+# that requests get 429, timed out waiters get 503, both with Retry-After.
+ADMISSION_CONTROL = {
+    'heavy': {'LIMIT': 2, 'QUEUE': 4, 'TIMEOUT': 10, 'RETRY_AFTER': 5},
+    'light': {'LIMIT': 64, 'QUEUE': 128, 'TIMEOUT': 2, 'RETRY_AFTER': 1},
+}
+
+# On-demand request profiling (see app_lms/middleware.py). A request is
+# profiled when it sends the HEADER with SECRET as its value (the header is
+# ignored while SECRET is empty) or is picked by SAMPLE_RATE. Output goes to
+# OUTPUT_DIR and stops once it holds MAX_DUMPS files.
+REQUEST_PROFILING = {
+    'ENABLED': False,
+    'HEADER': 'X-Profile',
+    'SECRET': '',
+    'MAX_DUMPS': 100,
+    'SAMPLE_RATE': 0.0,
+    'MODE': 'cprofile',
+    'SAMPLER_INTERVAL': 0.005,
+    'OUTPUT_DIR': BASE_DIR / 'profiles',
+}
+
+# Store translation values once in the content-addressed TranslationValue
+# table instead of copying them into every Translation row. Existing rows
+# are converted with `manage.py dedupe_translation_values`.
+TRANSLATION_VALUE_DEDUP = False
@@ -0,0 +1,42 @@
+"""
+Lean settings profile for API-only workers.
+
+Loads only what the app_lms API needs: no admin, sessions, messages,
+templates or django_extensions, and a JSON-only REST framework setup.
+Use with DJANGO_SETTINGS_MODULE=lms_demo.settings_api and compare start-up
+cost against the default profile with `manage.py benchmark_startup`, which
+forces the same DEBUG value on both (this profile turns DEBUG off).
+"""
+
+import os
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
+
+INSTALLED_APPS = [
+    'app_lms',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'app_lms.middleware.AdmissionControlMiddleware',
+    'app_lms.middleware.ProfilingMiddleware',
+]
+
+ROOT_URLCONF = 'lms_demo.urls_api'
+
+TEMPLATES = []
+
+AUTH_PASSWORD_VALIDATORS = []
+
+# No auth app: requests are anonymous and responses are rendered as JSON only
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': ['rest_framework.permissions.AllowAny'],
+    'UNAUTHENTICATED_USER': None,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+}
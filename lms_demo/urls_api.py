@@ -0,0 +1,8 @@
+"""
+URL configuration for the API-only settings profile (lms_demo.settings_api).
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('api/', include('app_lms.urls')),
+]